@@ -7,10 +7,20 @@ import os
 import glob
 import rasterio
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict
 
 logger = logging.getLogger(__name__)
 
+def _open_dtm_tile(tif_file):
+    """Open a single DTM tile, returning (tile_name, dataset or None)."""
+    tile_name = os.path.basename(tif_file)
+    try:
+        return tile_name, rasterio.open(tif_file)
+    except Exception as e:
+        logger.warning(f"Failed to load DTM tile {tile_name}: {e}")
+        return tile_name, None
+
 def load_fabdem_tiles() -> Dict:
     """
     Load FABDEM DTM tiles from the configured directory.
@@ -30,19 +40,52 @@ def load_fabdem_tiles() -> Dict:
     # Find all TIFF files in the FABDEM folder
     tif_files = glob.glob(os.path.join(fabdem_folder, '*.tif'))
     
+    # GDAL releases the GIL during I/O, so threads overlap tile opens
     dtm_datasets = {}
-    successful_loads = 0
-    
-    for tif_file in tif_files:
-        tile_name = os.path.basename(tif_file)
-        
-        try:
-            dtm_raster = rasterio.open(tif_file)
-            dtm_datasets[tile_name] = dtm_raster
-            successful_loads += 1
-            logger.debug(f"Loaded DTM tile: {tile_name}")
-        except Exception as e:
-            logger.warning(f"Failed to load DTM tile {tile_name}: {e}")
-    
-    logger.info(f"Successfully loaded {successful_loads} FABDEM DTM tiles")
+    with rasterio.Env(GDAL_CACHEMAX=512, GDAL_NUM_THREADS='ALL_CPUS'):
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            for tile_name, dtm_raster in executor.map(_open_dtm_tile, tif_files):
+                if dtm_raster is not None:
+                    dtm_datasets[tile_name] = dtm_raster
+                    logger.debug(f"Loaded DTM tile: {tile_name}")
+
+    logger.info(f"Successfully loaded {len(dtm_datasets)} FABDEM DTM tiles")
     return dtm_datasets
+
+def build_fabdem_vrt_mosaic(vrt_path='/vsimem/fabdem_mosaic.vrt'):
+    """
+    Build a single virtual mosaic over all FABDEM tiles.
+
+    A GDAL VRT lets consumers read arbitrary windows across tile seams
+    without choosing which file to open, and the GDAL block cache is shared
+    across adjacent windows instead of per open dataset.
+
+    Args:
+        vrt_path: Target path for the VRT (in-memory /vsimem by default)
+
+    Returns:
+        Open rasterio dataset over the mosaic, or None if unavailable
+    """
+    from config.config import Config
+
+    fabdem_folder = Config.FABDEM_DTM_FOLDER
+    tif_files = glob.glob(os.path.join(fabdem_folder, '*.tif'))
+    if not tif_files:
+        logger.error(f"No FABDEM tiles found in: {fabdem_folder}")
+        return None
+
+    try:
+        from osgeo import gdal
+    except ImportError:
+        logger.info("GDAL Python bindings not available, skipping VRT mosaic")
+        return None
+
+    try:
+        vrt = gdal.BuildVRT(vrt_path, tif_files)
+        vrt.FlushCache()
+        mosaic = rasterio.open(vrt_path)
+        logger.info(f"Built FABDEM VRT mosaic over {len(tif_files)} tiles")
+        return mosaic
+    except Exception as e:
+        logger.warning(f"Failed to build FABDEM VRT mosaic: {e}")
+        return None
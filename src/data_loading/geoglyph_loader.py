@@ -4,13 +4,36 @@ Handles loading of known archaeological sites from KML files.
 """
 
 import os
+import numpy as np
 import geopandas as gpd
 import logging
-from pykml import parser
-from shapely.geometry import Point
+from lxml import etree
 
 logger = logging.getLogger(__name__)
 
+KML_NAMESPACE = 'http://www.opengis.net/kml/2.2'
+
+# Prefer the pyogrio engine, which batches OGR reads into numpy arrays and
+# is much faster than Fiona for large shapefiles and GeoPackages
+try:
+    import pyogrio  # noqa: F401
+    gpd.options.io_engine = 'pyogrio'
+    PYOGRIO_AVAILABLE = True
+except ImportError:
+    PYOGRIO_AVAILABLE = False
+    logger.debug("pyogrio not available, falling back to the Fiona engine")
+
+def _read_vector_file(path, **kwargs):
+    """Read a vector file, adding the Arrow fast path when pyogrio is used."""
+    if PYOGRIO_AVAILABLE:
+        # use_arrow moves features GDAL -> Arrow -> GeoDataFrame without
+        # per-row Python object construction
+        try:
+            return gpd.read_file(path, use_arrow=True, **kwargs)
+        except Exception:
+            logger.debug(f"Arrow read failed for {path}, retrying without Arrow")
+    return gpd.read_file(path, **kwargs)
+
 def load_archaeological_sites():
     """
     Load archaeological sites from KML file.
@@ -28,25 +51,27 @@ def load_archaeological_sites():
         return gpd.GeoDataFrame()
     
     try:
-        # Parse KML file
-        with open(kml_path, 'r') as f:
-            root = parser.parse(f).getroot()
-        
-        # Extract coordinates from placemarks
-        coordinates = []
-        for placemark in root.Document.Placemark:
-            if hasattr(placemark, 'Point'):
-                coord_str = str(placemark.Point.coordinates)
-                lon, lat, _ = map(float, coord_str.strip().split(','))
-                coordinates.append(Point(lon, lat))
-        
-        # Create GeoDataFrame
+        # Stream only Point coordinates out of the KML instead of building
+        # the full document tree; the raw "lon,lat,alt" strings are kept
+        # as-is for one bulk numeric parse afterwards
+        coordinate_strings = []
+        point_coord_path = f'{{{KML_NAMESPACE}}}Point/{{{KML_NAMESPACE}}}coordinates'
+        for _, placemark in etree.iterparse(kml_path, tag=f'{{{KML_NAMESPACE}}}Placemark'):
+            coordinates_elem = placemark.find(point_coord_path)
+            if coordinates_elem is not None and coordinates_elem.text:
+                coordinate_strings.append(coordinates_elem.text.strip())
+            # Free the processed subtree so memory stays flat
+            placemark.clear(keep_tail=True)
+
+        # Parse every triple in one C-level pass instead of per-placemark
+        # float() calls, then build the points vectorized
+        coordinates = np.fromstring(','.join(coordinate_strings), sep=',').reshape(-1, 3)
         geoglyphs_gdf = gpd.GeoDataFrame(
             {'id': range(len(coordinates))},
-            geometry=coordinates,
+            geometry=gpd.points_from_xy(coordinates[:, 0], coordinates[:, 1]),
             crs='EPSG:4326'
         )
-        
+
         logger.info(f"Successfully parsed {len(geoglyphs_gdf)} geoglyph sites")
         return geoglyphs_gdf
         
@@ -73,7 +98,13 @@ def load_core_data():
     
     # Load hydrography data
     try:
-        hydro_gdf = gpd.read_file(Config.HYDROGRAPHY_SHP_PATH)
+        hydro_gdf = _read_vector_file(Config.HYDROGRAPHY_SHP_PATH)
+        # Build the STRtree once up front; geopandas caches it on the
+        # GeoDataFrame, so every later sindex query (e.g. the nearest-river
+        # lookups in extract_features_at_points) reuses this tree instead of
+        # rebuilding it on first use mid-pipeline
+        if not hydro_gdf.empty:
+            hydro_gdf.sindex
         logger.info(f"Successfully loaded hydrography data with {len(hydro_gdf)} segments")
     except Exception as e:
         logger.warning(f"Failed to load hydrography data: {e}")
@@ -81,7 +112,7 @@ def load_core_data():
     
     # Load PRODES deforestation data
     try:
-        prodes_gdf = gpd.read_file(Config.PRODES_GPKG_PATH, layer='accumulated_deforestation_2007')
+        prodes_gdf = _read_vector_file(Config.PRODES_GPKG_PATH, layer='accumulated_deforestation_2007')
         logger.info(f"Successfully loaded PRODES data with {len(prodes_gdf)} polygons")
     except Exception as e:
         logger.warning(f"Failed to load PRODES data: {e}")
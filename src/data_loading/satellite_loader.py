@@ -7,10 +7,104 @@ import os
 import numpy as np
 import rasterio
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Tuple, List
 
 logger = logging.getLogger(__name__)
 
+def _read_band(file_path):
+    """Read a single band file in its native dtype, for use from worker threads."""
+    with rasterio.open(file_path) as src:
+        # Preallocate the destination and read into it, so rasterio decodes
+        # straight into the final buffer instead of allocating an
+        # intermediate array and converting afterwards. The buffer must use
+        # the source dtype: HLS GeoTIFFs are int16 but Sentinel-2 L2A jp2
+        # bands are uint16, and a hard-coded int16 buffer silently clamps
+        # their upper range
+        band_array = np.empty(src.shape, dtype=src.dtypes[0])
+        src.read(1, out=band_array, masked=False)
+        return band_array
+
+def _pack_scene_cube(spectral_bands, band_list):
+    """
+    Repack per-band arrays into one contiguous (bands, H, W) cube.
+
+    The separately allocated band arrays are copied into a single block
+    in their native dtype and replaced by zero-copy axis-0 views into it,
+    so downstream code keeps its band-name accessors while index math
+    walks one stride-friendly allocation. Bands whose shape differs from
+    the first available band (e.g. 20m vs 10m Sentinel-2 resolutions) are
+    left as-is.
+    """
+    available = [band for band in band_list if spectral_bands.get(band) is not None]
+    if not available:
+        return spectral_bands
+
+    cube_shape = spectral_bands[available[0]].shape
+    packable = [band for band in available if spectral_bands[band].shape == cube_shape]
+
+    cube = np.empty((len(packable),) + cube_shape,
+                    dtype=spectral_bands[packable[0]].dtype)
+    packed_bands = dict(spectral_bands)
+    for i, band in enumerate(packable):
+        cube[i] = spectral_bands[band]
+        packed_bands[band] = cube[i]
+    return packed_bands
+
+# Scratch buffers for in-place index math, reused across scenes of the
+# same shape (the index computations run serially after the parallel reads)
+_scratch_numerator = None
+_scratch_denominator = None
+
+def _normalized_difference(band_a, band_b):
+    """
+    Compute (a - b) / (a + b + 1e-10) with in-place ufuncs.
+
+    Writes through reusable scratch buffers so each evaluation performs two
+    array writes instead of allocating three temporaries, then returns a
+    copy the caller owns.
+    """
+    global _scratch_numerator, _scratch_denominator
+
+    if _scratch_numerator is None or _scratch_numerator.shape != band_a.shape:
+        _scratch_numerator = np.empty(band_a.shape, dtype=np.float32)
+        _scratch_denominator = np.empty(band_a.shape, dtype=np.float32)
+
+    # dtype=np.float32 forces the float loop: with integer inputs NumPy
+    # would otherwise pick the integer loop and wrap on out-of-range sums
+    # before casting into the scratch buffer
+    np.subtract(band_a, band_b, out=_scratch_numerator, dtype=np.float32)
+    np.add(band_a, band_b, out=_scratch_denominator, dtype=np.float32)
+    _scratch_denominator += 1e-10
+    np.divide(_scratch_numerator, _scratch_denominator, out=_scratch_numerator)
+    return _scratch_numerator.copy()
+
+def _read_scene_bands_parallel(band_paths, max_workers=8):
+    """
+    Read many (scene, band) files concurrently.
+
+    Args:
+        band_paths: Dict mapping (scene, band) keys to file paths
+
+    Returns:
+        Dict mapping scene name to a dict of band arrays (None on failure)
+    """
+    scene_band_arrays = {}
+    # GDAL releases the GIL during read(), so threads overlap the I/O
+    with rasterio.Env(GDAL_CACHEMAX=512, GDAL_NUM_THREADS='ALL_CPUS'):
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            band_futures = {key: executor.submit(_read_band, path)
+                            for key, path in band_paths.items()}
+            for (scene, band), future in band_futures.items():
+                try:
+                    band_array = future.result()
+                    logger.debug(f"Loaded {band} - shape: {band_array.shape}")
+                except Exception as e:
+                    logger.warning(f"Failed to load {band} from {scene}: {e}")
+                    band_array = None
+                scene_band_arrays.setdefault(scene, {})[band] = band_array
+    return scene_band_arrays
+
 def process_nasa_hls_collection_systematically(nasa_folders: List[str], nasa_hls_folder: str) -> Tuple[Dict, Dict, Dict]:
     """
     Load and process NASA HLS collection with systematic temporal coverage.
@@ -35,45 +129,38 @@ def process_nasa_hls_collection_systematically(nasa_folders: List[str], nasa_hls
     enhanced_vegetation_indices = {}
     successful_scene_loads = 0
     
+    # Collect every (scene, band) file path, then read them all concurrently.
+    # Bands stay int16; float conversion is deferred until an index needs it.
+    band_list = ['B04', 'B08', 'B05', 'B06', 'B07', 'B8A', 'B11', 'B12']
+    band_paths = {}
     for folder in prioritized_nasa:
-        logger.info(f"Processing NASA HLS scene: {folder}")
-        
         # Convert folder name to HLS identifier format
         hls_identifier = folder.replace('nasa-hls-', 'HLS.').replace('-', '.').upper()
         folder_lower = folder.lower()
-        spectral_bands = {}
-        
-        # Load standard HLS bands
-        band_list = ['B04', 'B08', 'B05', 'B06', 'B07', 'B8A', 'B11', 'B12']
         for band in band_list:
             file_name = f"{hls_identifier}.v2.0.{band}.tif"
-            file_path = os.path.join(nasa_hls_folder, folder_lower, file_name)
-            
-            try:
-                with rasterio.open(file_path) as src:
-                    spectral_bands[band] = src.read(1)
-                logger.debug(f"Loaded {band} - shape: {spectral_bands[band].shape}")
-            except Exception as e:
-                logger.warning(f"Failed to load {band} from {folder}: {e}")
-                spectral_bands[band] = None
-        
+            band_paths[(folder, band)] = os.path.join(nasa_hls_folder, folder_lower, file_name)
+
+    scene_band_arrays = _read_scene_bands_parallel(band_paths)
+
+    for folder in prioritized_nasa:
+        logger.info(f"Processing NASA HLS scene: {folder}")
+        spectral_bands = _pack_scene_cube(scene_band_arrays.get(folder, {}), band_list)
+
         # Calculate vegetation indices if required bands are available
         if spectral_bands.get('B04') is not None and spectral_bands.get('B08') is not None:
             nasa_scene_data[folder] = spectral_bands
             successful_scene_loads += 1
             
-            # Calculate NDVI
-            red_band = spectral_bands['B04'].astype(np.float32)
-            nir_band = spectral_bands['B08'].astype(np.float32)
-            ndvi_array = (nir_band - red_band) / (nir_band + red_band + 1e-10)
-            
+            # Calculate NDVI in-place through the shared scratch buffers
+            ndvi_array = _normalized_difference(spectral_bands['B08'], spectral_bands['B04'])
+
             temporal_identifier = folder.split('-')[-1][:7]
             ndvi_temporal_series[temporal_identifier] = ndvi_array
-            
+
             # Calculate additional vegetation indices
             if spectral_bands.get('B05') is not None:
-                red_edge_band = spectral_bands['B05'].astype(np.float32)
-                ndre_array = (nir_band - red_edge_band) / (nir_band + red_edge_band + 1e-10)
+                ndre_array = _normalized_difference(spectral_bands['B08'], spectral_bands['B05'])
                 enhanced_vegetation_indices[f"{folder}_NDRE"] = ndre_array
             
             logger.debug(f"Vegetation indices calculated for {temporal_identifier}")
@@ -104,42 +191,85 @@ def process_copernicus_validation_collection_systematically(copernicus_folders:
     copernicus_ndvi_collection = {}
     successful_copernicus_loads = 0
     
+    # Collect Copernicus band paths at their native resolutions, then read
+    # them all concurrently through the shared thread-pool reader
+    copernicus_bands = ['B04_10m', 'B08_10m', 'B05_20m', 'B06_20m', 'B07_20m', 'B8A_20m', 'B11_20m', 'B12_20m']
+    band_paths = {}
     for folder in prioritized_copernicus:
-        logger.info(f"Processing Copernicus scene: {folder}")
-        
         # Convert folder name to tile identifier
         tile_identifier = folder.replace('copernicus-', '').replace('-', '_').upper()
         folder_lower = folder.lower()
-        spectral_bands = {}
-        
-        # Load Copernicus bands at different resolutions
-        copernicus_bands = ['B04_10m', 'B08_10m', 'B05_20m', 'B06_20m', 'B07_20m', 'B8A_20m', 'B11_20m', 'B12_20m']
         for band in copernicus_bands:
             file_name = f"{tile_identifier}_{band}.jp2"
-            file_path = os.path.join(copernicus_folder, folder_lower, file_name)
-            
-            try:
-                with rasterio.open(file_path) as src:
-                    spectral_bands[band] = src.read(1)
-                logger.debug(f"Loaded {band}")
-            except Exception as e:
-                logger.warning(f"Failed to load {band} from {folder}: {e}")
-                spectral_bands[band] = None
-        
+            band_paths[(folder, band)] = os.path.join(copernicus_folder, folder_lower, file_name)
+
+    scene_band_arrays = _read_scene_bands_parallel(band_paths)
+
+    for folder in prioritized_copernicus:
+        logger.info(f"Processing Copernicus scene: {folder}")
+        spectral_bands = _pack_scene_cube(scene_band_arrays.get(folder, {}), copernicus_bands)
+
         # Calculate high-resolution NDVI
         if spectral_bands.get('B04_10m') is not None and spectral_bands.get('B08_10m') is not None:
             copernicus_scene_data[folder] = spectral_bands
             successful_copernicus_loads += 1
             
-            red_10m = spectral_bands['B04_10m'].astype(np.float32)
-            nir_10m = spectral_bands['B08_10m'].astype(np.float32)
-            ndvi_10m = (nir_10m - red_10m) / (nir_10m + red_10m + 1e-10)
+            ndvi_10m = _normalized_difference(spectral_bands['B08_10m'], spectral_bands['B04_10m'])
             copernicus_ndvi_collection[folder] = ndvi_10m
             logger.debug("High-resolution NDVI calculated")
     
     logger.info(f"Copernicus processing complete: {successful_copernicus_loads}/{len(copernicus_folders)} scenes loaded")
     return copernicus_scene_data, copernicus_ndvi_collection
 
+def _compute_temporal_statistics_lazy(ndvi_time_series):
+    """
+    Compute temporal NDVI statistics without materializing the full stack.
+
+    Uses a chunked Dask stack when Dask is installed, evaluating all four
+    reductions in one shared task graph so each chunk is visited once and
+    chunks are processed in parallel. Falls back to the streaming Welford
+    helper otherwise.
+
+    Args:
+        ndvi_time_series: Dict of 2D NDVI arrays keyed by time period
+
+    Returns:
+        Dict containing temporal statistics
+    """
+    try:
+        import dask.array as da
+    except ImportError:
+        from feature_engineering.temporal_features import compute_streaming_temporal_statistics
+        return compute_streaming_temporal_statistics(ndvi_time_series.values())
+
+    ndvi_stack = da.stack([da.from_array(ndvi_array, chunks=(1024, 1024))
+                           for ndvi_array in ndvi_time_series.values()])
+
+    # Test for NaN once and reuse the mask for every statistic; the plain
+    # sum/min/max reductions avoid the per-element branching of the nan*
+    # variants and vectorize better
+    nan_mask = da.isnan(ndvi_stack)
+    valid_count = da.maximum((~nan_mask).sum(axis=0).astype(np.float32), 1.0)
+    ndvi_filled = da.where(nan_mask, 0.0, ndvi_stack)
+
+    mean = ndvi_filled.sum(axis=0) / valid_count
+    variance = da.where(nan_mask, 0.0, (ndvi_stack - mean)**2).sum(axis=0) / valid_count
+
+    # One compute() call shares the task graph across all reductions
+    temporal_mean, temporal_std, temporal_min, temporal_max = da.compute(
+        mean,
+        da.sqrt(variance),
+        da.where(nan_mask, np.inf, ndvi_stack).min(axis=0),
+        da.where(nan_mask, -np.inf, ndvi_stack).max(axis=0))
+
+    return {
+        'temporal_mean': temporal_mean,
+        'temporal_std': temporal_std,
+        'temporal_min': temporal_min,
+        'temporal_max': temporal_max,
+        'stability_index': 1.0 / (temporal_std + 0.001)
+    }
+
 def create_comprehensive_satellite_dataset(nasa_folders: List[str], copernicus_folders: List[str]) -> Dict:
     """
     Create comprehensive satellite dataset from NASA and Copernicus data.
@@ -160,17 +290,10 @@ def create_comprehensive_satellite_dataset(nasa_folders: List[str], copernicus_f
     copernicus_scenes, copernicus_ndvi = process_copernicus_validation_collection_systematically(
         copernicus_folders, Config.COPERNICUS_FOLDER)
     
-    # Temporal analysis statistics
+    # Temporal analysis statistics: lazy chunked reduction, no eager stack
     temporal_analysis_statistics = {}
     if len(ndvi_time_series) > 1:
-        ndvi_stack = np.stack(list(ndvi_time_series.values()))
-        temporal_analysis_statistics = {
-            'temporal_mean': np.nanmean(ndvi_stack, axis=0),
-            'temporal_std': np.nanstd(ndvi_stack, axis=0),
-            'temporal_min': np.nanmin(ndvi_stack, axis=0),
-            'temporal_max': np.nanmax(ndvi_stack, axis=0),
-            'stability_index': 1.0 / (np.nanstd(ndvi_stack, axis=0) + 0.001)
-        }
+        temporal_analysis_statistics = _compute_temporal_statistics_lazy(ndvi_time_series)
     
     comprehensive_satellite_data = {
         'nasa_scenes': nasa_scenes,
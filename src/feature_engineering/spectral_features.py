@@ -11,10 +11,27 @@ logger = logging.getLogger(__name__)
 def compute_advanced_spectral_indices(spectral_bands):
     """Advanced spectral indices for archaeological detection"""
     indices = {}
-    
+
+    # Mirror the CPU/GPU split used for topographic features: the index math
+    # is purely element-wise, so it runs unchanged on CuPy arrays when a
+    # usable GPU is present and on NumPy otherwise. A CPU-only cupy install
+    # (no device, driver mismatch) must also fall back.
+    try:
+        import cupy as cp
+        if cp.cuda.runtime.getDeviceCount() > 0:
+            xp = cp
+        else:
+            cp = None
+            xp = np
+    except Exception:
+        cp = None
+        xp = np
+
     def safe_extract(band_key):
+        # Bands arrive as int16 reflectance; convert (and upload, on GPU)
+        # here at index-computation time
         if band_key in spectral_bands and spectral_bands[band_key] is not None:
-            return spectral_bands[band_key].astype(np.float32)
+            return xp.asarray(spectral_bands[band_key], dtype=xp.float32)
         return None
     
     red = safe_extract('B04')
@@ -25,20 +42,26 @@ def compute_advanced_spectral_indices(spectral_bands):
     swir1 = safe_extract('B11')
     swir2 = safe_extract('B12')
     
-    # Only calculate indices if required bands exist
+    # Only calculate indices if required bands exist.
+    # Shared sums/differences are computed once and reused across indices
+    # so each band pair makes a single trip through memory.
     if red is not None and nir is not None:
-        indices['NDVI'] = (nir - red) / (nir + red + 1e-10)
-        indices['EVI2'] = 2.5 * (nir - red) / (nir + 2.4 * red + 1.0)
+        nir_minus_red = nir - red
+        nir_plus_red = nir + red
+        indices['NDVI'] = nir_minus_red / (nir_plus_red + 1e-10)
+        indices['EVI2'] = 2.5 * nir_minus_red / (nir + 2.4 * red + 1.0)
         L = 0.5
-        indices['SAVI'] = ((nir - red) / (nir + red + L)) * (1 + L)
-    
+        indices['SAVI'] = (nir_minus_red / (nir_plus_red + L)) * (1 + L)
+
     if red_edge1 is not None and nir is not None:
         indices['NDRE1'] = (nir - red_edge1) / (nir + red_edge1 + 1e-10)
-    
+
     # Check all required bands before calculation
     if red is not None and nir is not None and swir1 is not None and blue is not None:
-        indices['BSI'] = ((swir1 + red) - (nir + blue)) / ((swir1 + red) + (nir + blue) + 1e-10)
-    
+        swir1_plus_red = swir1 + red
+        nir_plus_blue = nir + blue
+        indices['BSI'] = (swir1_plus_red - nir_plus_blue) / (swir1_plus_red + nir_plus_blue + 1e-10)
+
     if swir1 is not None and nir is not None:
         indices['SCI'] = (swir1 - nir) / (swir1 + nir + 1e-10)
     
@@ -48,7 +71,11 @@ def compute_advanced_spectral_indices(spectral_bands):
         # Only calculate EDI if BSI was successfully calculated
         if 'BSI' in indices and 'NDVI' in indices:
             indices['EDI'] = (indices['BSI'] - indices['NDVI']) / 2.0
-    
+
+    # Download only the final results when computed on the GPU
+    if cp is not None:
+        indices = {name: cp.asnumpy(values) for name, values in indices.items()}
+
     logger.info(f"Computed {len(indices)} spectral indices")
     return indices
 
@@ -66,41 +93,40 @@ def extract_features_at_points(points_gdf, feature_rasters, dtm_raster, rivers_g
         DataFrame with extracted feature values
     """
     import pandas as pd
-    
+
     logger.info(f"Extracting features at {len(points_gdf)} points")
-    
-    feature_data = []
-    
-    for idx, point in points_gdf.iterrows():
+
+    # Invert the affine transform once, then broadcast it over every point;
+    # dtm_raster.index() would redo the inversion per call
+    xs = points_gdf.geometry.x.values
+    ys = points_gdf.geometry.y.values
+    inverse_transform = ~dtm_raster.transform
+    fractional_cols, fractional_rows = inverse_transform * (xs, ys)
+    rows = np.floor(fractional_rows).astype(np.int64)
+    cols = np.floor(fractional_cols).astype(np.int64)
+
+    feature_data = {}
+
+    # Fancy-index each raster with the full row/col arrays at once;
+    # out-of-bounds points get the 0.0 default
+    for feature_name, feature_array in feature_rasters.items():
+        in_bounds = ((rows >= 0) & (rows < feature_array.shape[0]) &
+                     (cols >= 0) & (cols < feature_array.shape[1]))
+        values = np.zeros(len(points_gdf), dtype=np.float64)
+        values[in_bounds] = feature_array[rows[in_bounds], cols[in_bounds]]
+        feature_data[feature_name] = values
+
+    # Calculate distance to nearest river via the rivers' spatial index,
+    # querying all points in one bulk nearest-neighbor call
+    if not rivers_gdf.empty:
         try:
-            # Convert point to pixel coordinates
-            row, col = dtm_raster.index(point.geometry.x, point.geometry.y)
-            
-            # Extract features
-            point_features = {}
-            for feature_name, feature_array in feature_rasters.items():
-                if 0 <= row < feature_array.shape[0] and 0 <= col < feature_array.shape[1]:
-                    point_features[feature_name] = feature_array[row, col]
-                else:
-                    point_features[feature_name] = 0.0
-            
-            # Calculate distance to nearest river
-            if not rivers_gdf.empty:
-                try:
-                    distances = rivers_gdf.distance(point.geometry)
-                    point_features['distance_to_river'] = distances.min()
-                except:
-                    point_features['distance_to_river'] = 1000.0  # Default distance
-            else:
-                point_features['distance_to_river'] = 1000.0
-            
-            feature_data.append(point_features)
-            
+            _, distances = rivers_gdf.sindex.nearest(
+                points_gdf.geometry, return_all=False, return_distance=True)
+            feature_data['distance_to_river'] = distances
         except Exception as e:
-            logger.warning(f"Failed to extract features for point {idx}: {e}")
-            # Add default values
-            default_features = {name: 0.0 for name in feature_rasters.keys()}
-            default_features['distance_to_river'] = 1000.0
-            feature_data.append(default_features)
-    
+            logger.warning(f"River distance calculation failed: {e}")
+            feature_data['distance_to_river'] = np.full(len(points_gdf), 1000.0)
+    else:
+        feature_data['distance_to_river'] = np.full(len(points_gdf), 1000.0)
+
     return pd.DataFrame(feature_data)
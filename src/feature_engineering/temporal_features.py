@@ -33,40 +33,105 @@ def perform_advanced_temporal_analysis(ndvi_time_series):
             'trend_slope': np.zeros(dummy_shape)
         }
     
-    # Stack NDVI arrays
-    ndvi_stack = np.stack(list(ndvi_time_series.values()))
-    
-    # Calculate temporal statistics
-    temporal_features = {
-        'temporal_mean': np.nanmean(ndvi_stack, axis=0),
-        'temporal_std': np.nanstd(ndvi_stack, axis=0),
-        'temporal_min': np.nanmin(ndvi_stack, axis=0),
-        'temporal_max': np.nanmax(ndvi_stack, axis=0),
-        'stability_index': 1.0 / (np.nanstd(ndvi_stack, axis=0) + 0.001),
-        'trend_slope': calculate_temporal_trend(ndvi_stack)
-    }
-    
+    # Stream all statistics in one pass without stacking the time series
+    temporal_features = compute_streaming_temporal_statistics(
+        ndvi_time_series.values(), include_trend=True)
+
     logger.info(f"Generated {len(temporal_features)} temporal features")
     return temporal_features
 
+def compute_streaming_temporal_statistics(ndvi_arrays, include_trend=False):
+    """
+    Compute per-pixel temporal statistics in a single streaming pass.
+
+    Uses Welford's online algorithm so the full (time, height, width) stack
+    is never materialized: only (height, width) accumulators are kept while
+    the NDVI arrays are visited once each.
+
+    Args:
+        ndvi_arrays: Iterable of 2D NDVI arrays in temporal order
+        include_trend: Whether to also accumulate the OLS trend slope
+
+    Returns:
+        Dict containing temporal statistics (and 'trend_slope' if requested)
+    """
+    n_valid = mean = m2 = None
+
+    for t, ndvi_array in enumerate(ndvi_arrays):
+        ndvi_array = np.asarray(ndvi_array, dtype=np.float32)
+        valid_mask = ~np.isnan(ndvi_array)
+        ndvi_filled = np.where(valid_mask, ndvi_array, 0.0)
+
+        if n_valid is None:
+            shape = ndvi_array.shape
+            n_valid = np.zeros(shape, dtype=np.float32)
+            mean = np.zeros(shape, dtype=np.float32)
+            m2 = np.zeros(shape, dtype=np.float32)
+            min_value = np.full(shape, np.inf, dtype=np.float32)
+            max_value = np.full(shape, -np.inf, dtype=np.float32)
+            if include_trend:
+                sum_t = np.zeros(shape, dtype=np.float32)
+                sum_y = np.zeros(shape, dtype=np.float32)
+                sum_ty = np.zeros(shape, dtype=np.float32)
+                sum_tt = np.zeros(shape, dtype=np.float32)
+
+        # Welford update, restricted to valid observations
+        n_valid += valid_mask
+        delta = np.where(valid_mask, ndvi_array - mean, 0.0)
+        mean += delta / np.maximum(n_valid, 1.0)
+        m2 += delta * np.where(valid_mask, ndvi_array - mean, 0.0)
+
+        # fmin/fmax propagate the non-NaN operand, so no nanmin/nanmax pass
+        min_value = np.fmin(min_value, ndvi_array)
+        max_value = np.fmax(max_value, ndvi_array)
+
+        if include_trend:
+            sum_t += t * valid_mask
+            sum_y += ndvi_filled
+            sum_ty += t * ndvi_filled
+            sum_tt += t * t * valid_mask
+
+    std = np.sqrt(m2 / np.maximum(n_valid, 1.0))
+
+    temporal_statistics = {
+        'temporal_mean': mean,
+        'temporal_std': std,
+        'temporal_min': min_value,
+        'temporal_max': max_value,
+        'stability_index': 1.0 / (std + 0.001)
+    }
+
+    if include_trend:
+        # Closed-form OLS slope from the streamed regression sums
+        trend_slope = (n_valid * sum_ty - sum_t * sum_y) / (n_valid * sum_tt - sum_t**2 + 1e-10)
+        temporal_statistics['trend_slope'] = np.where(n_valid > 1, trend_slope, 0.0)
+
+    return temporal_statistics
+
 def calculate_temporal_trend(ndvi_stack):
-    """Calculate temporal trend using linear regression."""
-    n_times, height, width = ndvi_stack.shape
-    time_points = np.arange(n_times)
-    
-    # Initialize trend array
-    trend_slope = np.zeros((height, width))
-    
-    # Calculate trend for each pixel
-    for i in range(height):
-        for j in range(width):
-            pixel_series = ndvi_stack[:, i, j]
-            if not np.isnan(pixel_series).all():
-                # Simple linear trend calculation
-                valid_mask = ~np.isnan(pixel_series)
-                if np.sum(valid_mask) > 1:
-                    x = time_points[valid_mask]
-                    y = pixel_series[valid_mask]
-                    trend_slope[i, j] = np.polyfit(x, y, 1)[0]
-    
+    """Calculate temporal trend using vectorized linear regression.
+
+    Computes the closed-form OLS slope for every pixel at once instead of
+    calling np.polyfit per pixel, which keeps the whole calculation inside
+    a handful of NumPy reductions over the (time, height, width) stack.
+    """
+    n_times = ndvi_stack.shape[0]
+    time_points = np.arange(n_times, dtype=np.float32)[:, None, None]
+
+    # NaN-safe sums: mask invalid observations and replace them with zero
+    valid_mask = ~np.isnan(ndvi_stack)
+    ndvi_filled = np.where(valid_mask, ndvi_stack, 0.0)
+
+    n_valid = valid_mask.sum(axis=0)
+    sum_t = (time_points * valid_mask).sum(axis=0)
+    sum_y = ndvi_filled.sum(axis=0)
+    sum_ty = (time_points * ndvi_filled).sum(axis=0)
+    sum_tt = (time_points**2 * valid_mask).sum(axis=0)
+
+    # Closed-form OLS slope: (n*Σty - Σt*Σy) / (n*Σtt - Σt²)
+    trend_slope = (n_valid * sum_ty - sum_t * sum_y) / (n_valid * sum_tt - sum_t**2 + 1e-10)
+
+    # Pixels with fewer than 2 valid observations have no defined trend
+    trend_slope = np.where(n_valid > 1, trend_slope, 0.0)
+
     return trend_slope
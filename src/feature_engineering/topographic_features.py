@@ -3,49 +3,157 @@ Topographic feature engineering module.
 Computes advanced topographic features for archaeological detection.
 """
 
+import os
 import numpy as np
 import logging
-from scipy.ndimage import gaussian_filter, generic_filter
+from concurrent.futures import ThreadPoolExecutor
+from scipy.ndimage import gaussian_filter, uniform_filter
 
 logger = logging.getLogger(__name__)
 
+def _apply_filter_tiled(dtm_array, filter_func, halo, tile_size=512):
+    """
+    Apply a neighborhood filter block-wise with a halo, in parallel.
+
+    Large-kernel scipy filters over a full raster thrash the cache; running
+    them per (tile_size, tile_size) block keeps the working set in L2/L3,
+    and scipy releases the GIL so blocks filter concurrently. The halo must
+    cover the filter's support so interior tile edges match the full-array
+    result.
+    """
+    height, width = dtm_array.shape
+    if height <= tile_size and width <= tile_size:
+        return filter_func(dtm_array)
+
+    output = np.empty_like(dtm_array)
+
+    def _process_tile(i0, i1, j0, j1):
+        hi0, hi1 = max(i0 - halo, 0), min(i1 + halo, height)
+        hj0, hj1 = max(j0 - halo, 0), min(j1 + halo, width)
+        filtered = filter_func(dtm_array[hi0:hi1, hj0:hj1])
+        output[i0:i1, j0:j1] = filtered[i0 - hi0:i1 - hi0, j0 - hj0:j1 - hj0]
+
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        futures = [executor.submit(_process_tile,
+                                   i0, min(i0 + tile_size, height),
+                                   j0, min(j0 + tile_size, width))
+                   for i0 in range(0, height, tile_size)
+                   for j0 in range(0, width, tile_size)]
+        for future in futures:
+            future.result()
+
+    return output
+
+# Optional Numba acceleration for the fused surface-derivative kernel
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _fused_surface_derivatives(dtm_array):
+        """Fused slope/aspect/curvature kernel.
+
+        Computes first and second surface derivatives per pixel in a single
+        parallel pass, so the raster is read from memory once instead of
+        allocating separate gx/gy/gxx/gxy/gyy intermediates.
+        """
+        height, width = dtm_array.shape
+        slope = np.empty((height, width), dtype=dtm_array.dtype)
+        aspect = np.empty((height, width), dtype=dtm_array.dtype)
+        profile_curv = np.empty((height, width), dtype=dtm_array.dtype)
+        plan_curv = np.empty((height, width), dtype=dtm_array.dtype)
+
+        for i in prange(height):
+            i0 = max(i - 1, 0)
+            i1 = min(i + 1, height - 1)
+            di = i1 - i0
+            for j in range(width):
+                j0 = max(j - 1, 0)
+                j1 = min(j + 1, width - 1)
+                dj = j1 - j0
+
+                # First derivatives (central differences, one-sided at edges)
+                gx = (dtm_array[i, j1] - dtm_array[i, j0]) / dj
+                gy = (dtm_array[i1, j] - dtm_array[i0, j]) / di
+
+                # Second derivatives
+                gxx = dtm_array[i, j1] - 2.0 * dtm_array[i, j] + dtm_array[i, j0]
+                gyy = dtm_array[i1, j] - 2.0 * dtm_array[i, j] + dtm_array[i0, j]
+                gxy = (dtm_array[i1, j1] - dtm_array[i1, j0] -
+                       dtm_array[i0, j1] + dtm_array[i0, j0]) / (di * dj)
+
+                gx2 = gx * gx
+                gy2 = gy * gy
+                grad_mag2 = gx2 + gy2 + 1e-10
+
+                slope[i, j] = np.sqrt(gx2 + gy2)
+                aspect[i, j] = np.arctan2(gy, gx)
+                profile_curv[i, j] = (gxx * gx2 + 2.0 * gxy * gx * gy + gyy * gy2) / grad_mag2**1.5
+                plan_curv[i, j] = (gxx * gy2 - 2.0 * gxy * gx * gy + gyy * gx2) / grad_mag2
+
+        return slope, aspect, profile_curv, plan_curv
+
 def compute_revolutionary_topographic_features(dtm_array):
     """Compute advanced topographic features for archaeological detection - CPU version"""
     features = {}
-    
+
     # Basic elevation
     features['elevation'] = dtm_array
+
+    # Gradient and curvature analysis: single fused Numba kernel when
+    # available, otherwise the equivalent NumPy expressions
+    if NUMBA_AVAILABLE:
+        slope, aspect, profile_curv, plan_curv = _fused_surface_derivatives(
+            np.ascontiguousarray(dtm_array, dtype=np.float64))
+        features['slope'] = slope
+        features['aspect'] = aspect
+    else:
+        gy, gx = np.gradient(dtm_array)
+        features['slope'] = np.sqrt(gx**2 + gy**2)
+        features['aspect'] = np.arctan2(gy, gx)
     
-    # Gradient analysis
-    gy, gx = np.gradient(dtm_array)
-    features['slope'] = np.sqrt(gx**2 + gy**2)
-    features['aspect'] = np.arctan2(gy, gx)
-    
-    # Topographic anomaly (critical for earthwork detection)
-    smoothed = gaussian_filter(dtm_array, sigma=15, mode='reflect')
+    # Topographic anomaly (critical for earthwork detection).
+    # Halo of 4*sigma matches scipy's default truncation radius.
+    smoothed = _apply_filter_tiled(
+        dtm_array,
+        lambda block: gaussian_filter(block, sigma=15, mode='reflect'),
+        halo=int(4.0 * 15 + 0.5))
     features['topo_anomaly'] = dtm_array - smoothed
     
-    # Multi-scale TPI with proper generic_filter import
+    # Multi-scale TPI via separable uniform_filter instead of generic_filter
     for radius in [3, 7, 15]:
         try:
-            kernel = np.ones((radius*2+1, radius*2+1))
-            kernel[radius, radius] = 0
-            mean_neighbor = generic_filter(dtm_array, np.mean, footprint=kernel)
+            size = radius * 2 + 1
+            n_cells = size * size
+            # Mean over the full window, then remove the center pixel's
+            # contribution to match the hollow-footprint neighborhood mean
+            window_mean = _apply_filter_tiled(
+                dtm_array,
+                lambda block: uniform_filter(block, size=size, mode='reflect'),
+                halo=radius)
+            mean_neighbor = (window_mean * n_cells - dtm_array) / (n_cells - 1)
             features[f'tpi_scale_{radius}'] = dtm_array - mean_neighbor
         except Exception as e:
             logger.warning(f"TPI calculation failed for radius {radius}: {e}")
             features[f'tpi_scale_{radius}'] = np.zeros_like(dtm_array)
     
     # Advanced curvature analysis
-    try:
-        gyy, gyx = np.gradient(gy)
-        gxy, gxx = np.gradient(gx)
-        features['profile_curvature'] = (gxx * gx**2 + 2 * gxy * gx * gy + gyy * gy**2) / (gx**2 + gy**2 + 1e-10)**(3/2)
-        features['plan_curvature'] = (gxx * gy**2 - 2 * gxy * gx * gy + gyy * gx**2) / (gx**2 + gy**2 + 1e-10)
-    except Exception as e:
-        logger.warning(f"Curvature calculation failed: {e}")
-        features['profile_curvature'] = np.zeros_like(dtm_array)
-        features['plan_curvature'] = np.zeros_like(dtm_array)
+    if NUMBA_AVAILABLE:
+        features['profile_curvature'] = profile_curv
+        features['plan_curvature'] = plan_curv
+    else:
+        try:
+            gyy, gyx = np.gradient(gy)
+            gxy, gxx = np.gradient(gx)
+            features['profile_curvature'] = (gxx * gx**2 + 2 * gxy * gx * gy + gyy * gy**2) / (gx**2 + gy**2 + 1e-10)**(3/2)
+            features['plan_curvature'] = (gxx * gy**2 - 2 * gxy * gx * gy + gyy * gx**2) / (gx**2 + gy**2 + 1e-10)
+        except Exception as e:
+            logger.warning(f"Curvature calculation failed: {e}")
+            features['profile_curvature'] = np.zeros_like(dtm_array)
+            features['plan_curvature'] = np.zeros_like(dtm_array)
     
     logger.info(f"Computed {len(features)} topographic features")
     return features
@@ -13,7 +13,7 @@ import pandas as pd
 import numpy as np
 import geopandas as gpd
 from datetime import datetime
-from shapely.geometry import Point, box
+import shapely
 from sklearn.model_selection import train_test_split, cross_val_score, StratifiedKFold
 from sklearn.metrics import roc_auc_score
 from sklearn.utils import resample
@@ -32,18 +32,44 @@ from data_loading.geoglyph_loader import load_core_data
 from feature_engineering.topographic_features import compute_revolutionary_topographic_features, compute_revolutionary_topographic_features_GPU
 from feature_engineering.temporal_features import perform_advanced_temporal_analysis
 from feature_engineering.spectral_features import compute_advanced_spectral_indices, extract_features_at_points
-from models.archaeological_ensemble import UltimateArchaeologicalEnsemble
-from visualization.interactive_maps import create_ultimate_interactive_map
-from visualization.ai_analysis import generate_ai_archaeological_analysis
 from utils.memory_management import cleanup_memory
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Precompiled FABDEM filename pattern, shared by all bounds parsing
+FABDEM_FILENAME_PATTERN = re.compile(r'S(\d+)W(\d+)_FABDEM_V1-2\.tif')
+
+# Optional Numba JIT for the AABB overlap prefilter
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _aabb_overlap_mask(tile_bounds, geoglyph_bounds):
+        """Single compiled pass over the (N, 4) tile-bounds array."""
+        overlap_mask = np.empty(tile_bounds.shape[0], np.bool_)
+        for i in range(tile_bounds.shape[0]):
+            overlap_mask[i] = not (tile_bounds[i, 0] > geoglyph_bounds[2] or
+                                   tile_bounds[i, 2] < geoglyph_bounds[0] or
+                                   tile_bounds[i, 1] > geoglyph_bounds[3] or
+                                   tile_bounds[i, 3] < geoglyph_bounds[1])
+        return overlap_mask
+else:
+    def _aabb_overlap_mask(tile_bounds, geoglyph_bounds):
+        """Vectorized NumPy fallback for the AABB overlap test."""
+        return ~((tile_bounds[:, 0] > geoglyph_bounds[2]) |
+                 (tile_bounds[:, 2] < geoglyph_bounds[0]) |
+                 (tile_bounds[:, 1] > geoglyph_bounds[3]) |
+                 (tile_bounds[:, 3] < geoglyph_bounds[1]))
+
 def parse_bounds_from_filename_CORRECT(filename):
     """Parse bounds from FABDEM filename format: S01W061_FABDEM_V1-2.tif"""
-    match = re.match(r'S(\d+)W(\d+)_FABDEM_V1-2\.tif', filename)
+    match = FABDEM_FILENAME_PATTERN.match(filename)
     if not match:
         return None
     
@@ -76,27 +102,63 @@ def find_overlapping_dtm_tiles_FIXED(dtm_datasets, geoglyphs_gdf):
     logger.info("Finding Overlapping DTM Tiles (FIXED for your format)")
     geoglyph_bounds = geoglyphs_gdf.total_bounds
     logger.info(f"Geoglyph bounds: {geoglyph_bounds}")
-    
-    overlapping_dtm_tiles = {}
-    
-    for dtm_name, dtm_raster in dtm_datasets.items():
-        # FIXED: Parse bounds from your actual filename format
+
+    # Reproject the geoglyphs once up front (skipping the PROJ round-trip
+    # entirely when they are already in EPSG:4326)
+    if geoglyphs_gdf.crs and geoglyphs_gdf.crs.to_epsg() == 4326:
+        geoglyphs_wgs = geoglyphs_gdf
+    else:
+        geoglyphs_wgs = geoglyphs_gdf.to_crs('EPSG:4326')
+
+    # Parse every filename once and stack tile bounds into one (N, 4) array
+    tile_names = []
+    bounds_list = []
+    for dtm_name in dtm_datasets:
         tile_bounds = parse_bounds_from_filename_CORRECT(dtm_name)
-        
-        if tile_bounds and check_overlap_CORRECT(tile_bounds, geoglyph_bounds):
-            # Double-check with actual spatial join
-            dtm_poly = box(*tile_bounds)
-            dtm_gdf = gpd.GeoDataFrame([1], geometry=[dtm_poly], crs='EPSG:4326')
-            sites_in_tile = gpd.sjoin(geoglyphs_gdf.to_crs('EPSG:4326'), dtm_gdf, how="inner", predicate='intersects')
-            
-            if not sites_in_tile.empty:
-                overlapping_dtm_tiles[dtm_name] = {
-                    'raster': dtm_raster,
-                    'sites': sites_in_tile,
-                    'bounds': tile_bounds
-                }
-                logger.info(f"Found {dtm_name}: {len(sites_in_tile)} sites - Bounds: {tile_bounds}")
-    
+        if tile_bounds is not None:
+            tile_names.append(dtm_name)
+            bounds_list.append(tile_bounds)
+
+    if not tile_names:
+        logger.info("Found 0 overlapping DTM tiles")
+        return {}
+
+    tile_bounds_array = np.array(bounds_list, dtype=np.float64)
+
+    # AABB prefilter against the overall geoglyph bounds (JIT-compiled
+    # when Numba is available, vectorized NumPy otherwise)
+    overlap_mask = _aabb_overlap_mask(tile_bounds_array,
+                                      np.asarray(geoglyph_bounds, dtype=np.float64))
+
+    candidate_names = [name for name, keep in zip(tile_names, overlap_mask) if keep]
+    candidate_bounds = tile_bounds_array[overlap_mask]
+
+    overlapping_dtm_tiles = {}
+
+    if candidate_names:
+        # Double-check with one STRtree bulk query over all surviving tiles;
+        # shapely.box builds every tile polygon in a single GEOS call and the
+        # tree's predicate path uses prepared geometries internally
+        tile_polygons = shapely.box(candidate_bounds[:, 0], candidate_bounds[:, 1],
+                                    candidate_bounds[:, 2], candidate_bounds[:, 3])
+        tile_tree = shapely.STRtree(tile_polygons)
+        site_indices, tile_indices = tile_tree.query(geoglyphs_wgs.geometry.values,
+                                                     predicate='intersects')
+
+        # Keep only flat arrays per tile: positional site indices and the
+        # bounds row. Site geometries are rehydrated on demand downstream
+        # via geoglyphs_gdf.iloc[site_idx] instead of storing a per-tile
+        # GeoDataFrame slice
+        for tile_index in np.unique(tile_indices):
+            tile_name = candidate_names[tile_index]
+            site_idx = site_indices[tile_indices == tile_index].astype(np.int32)
+            overlapping_dtm_tiles[tile_name] = {
+                'raster': dtm_datasets[tile_name],
+                'site_idx': site_idx,
+                'bounds': candidate_bounds[tile_index]
+            }
+            logger.info(f"Found {tile_name}: {site_idx.size} sites - Bounds: {candidate_bounds[tile_index].tolist()}")
+
     logger.info(f"Found {len(overlapping_dtm_tiles)} overlapping DTM tiles")
     return overlapping_dtm_tiles
 
@@ -104,45 +166,27 @@ def sort_tiles_by_priority(overlapping_dtm_tiles):
     """Sort DTM tiles by number of overlapping sites with enhanced coverage strategy"""
     logger.info("Sorting tiles by archaeological site density...")
     
-    # Create list of (tile_name, site_count, tile_info)
-    tiles_with_counts = []
-    for tile_name, tile_info in overlapping_dtm_tiles.items():
-        site_count = len(tile_info['sites'])
-        tiles_with_counts.append((tile_name, site_count, tile_info))
-    
-    # Sort by site count (descending - most sites first)
-    sorted_tiles = sorted(tiles_with_counts, key=lambda x: x[1], reverse=True)
-    
-    # Calculate cumulative coverage and find optimal strategies
-    total_sites = sum([count for _, count, _ in sorted_tiles])
-    cumulative_sites = 0
-    optimal_count_80 = 0
-    optimal_count_90 = 0
-    optimal_count_95 = 0
-    tiles_with_10plus = 0
-    
+    # Site counts as one array, sorted descending (most sites first)
+    tile_names = list(overlapping_dtm_tiles)
+    site_counts = np.fromiter((tile_info['site_idx'].size for tile_info in overlapping_dtm_tiles.values()),
+                              dtype=np.int64, count=len(tile_names))
+    order = np.argsort(-site_counts, kind='stable')
+    sorted_counts = site_counts[order]
+
+    # Cumulative coverage curve and milestones, all from vectorized ops
+    total_sites = int(sorted_counts.sum())
+    coverage_curve = np.cumsum(sorted_counts) / total_sites
+    optimal_count_80, optimal_count_90, optimal_count_95 = (
+        int(index) + 1 for index in np.searchsorted(coverage_curve, [0.8, 0.9, 0.95]))
+    # Counts are sorted descending, so this is the number of tiles with 10+
+    tiles_with_10plus = int(np.searchsorted(-sorted_counts, -10, side='right'))
+
     logger.info(f"Total sites across all tiles: {total_sites}")
     logger.info(f"Top tiles by site density:")
-    
-    for i, (tile_name, site_count, _) in enumerate(sorted_tiles):
-        cumulative_sites += site_count
-        coverage = cumulative_sites / total_sites
-        
-        # Track coverage milestones
-        if coverage >= 0.8 and optimal_count_80 == 0:
-            optimal_count_80 = i + 1
-        if coverage >= 0.9 and optimal_count_90 == 0:
-            optimal_count_90 = i + 1
-        if coverage >= 0.95 and optimal_count_95 == 0:
-            optimal_count_95 = i + 1
-        
-        # Track tiles with significant sites (10+)
-        if site_count >= 10:
-            tiles_with_10plus = i + 1
-        
-        # Print top 15 tiles
-        if i < 15:
-            logger.info(f"   #{i+1}: {tile_name} - {site_count} sites ({coverage*100:.1f}% cumulative)")
+
+    # Print top 15 tiles
+    for i in range(min(15, len(tile_names))):
+        logger.info(f"   #{i+1}: {tile_names[order[i]]} - {sorted_counts[i]} sites ({coverage_curve[i]*100:.1f}% cumulative)")
     
     # Enhanced strategy: Choose the best approach
     logger.info(f"Coverage Analysis:")
@@ -153,69 +197,79 @@ def sort_tiles_by_priority(overlapping_dtm_tiles):
     
     # Strategy: Use 90% coverage OR all tiles with 10+ sites, whichever is MORE
     optimal_count = max(optimal_count_90, tiles_with_10plus)
-    
-    final_coverage = sum([count for _, count, _ in sorted_tiles[:optimal_count]]) / total_sites
-    
+
+    final_coverage = float(coverage_curve[optimal_count - 1]) if optimal_count > 0 else 0.0
+
     logger.info(f"Selected strategy: {optimal_count} tiles")
     logger.info(f"   Final coverage: {final_coverage*100:.1f}% of all sites")
     logger.info(f"   Rationale: {'90% coverage achieved' if optimal_count == optimal_count_90 else 'Including all high-value tiles (10+ sites)'}")
-    
+
     # Return sorted dictionary
-    sorted_dict = {tile_name: tile_info for tile_name, _, tile_info in sorted_tiles}
+    sorted_dict = {tile_names[i]: overlapping_dtm_tiles[tile_names[i]] for i in order}
     return sorted_dict, optimal_count
 
-def generate_realistic_negatives(sites_in_tile, dtm_raster):
+def generate_realistic_negatives(sites_in_tile, dtm_raster, rng=None):
     """Generate challenging negative samples near positive sites"""
+    # PCG64 generator: faster draws than the legacy global Mersenne Twister
+    # state, and safe to use from worker threads without a lock
+    if rng is None:
+        rng = np.random.default_rng()
     
     # Calculate number of negatives needed
     n_negative = min(len(sites_in_tile) * 2, 100)
-    
-    negative_points = []
+
     bounds = dtm_raster.bounds
-    
+    near_x = np.empty(0)
+    near_y = np.empty(0)
+
     # 70% of negatives: Near positive sites (within 1-5km) - HARDER NEGATIVES
     near_negatives_needed = int(n_negative * 0.7)
     sites_to_sample = min(len(sites_in_tile), near_negatives_needed)
-    
+
     if sites_to_sample > 0:
         sampled_sites = sites_in_tile.sample(sites_to_sample) if len(sites_in_tile) > sites_to_sample else sites_in_tile
-        
-        for _, site in sampled_sites.iterrows():
-            for _ in range(max(1, near_negatives_needed // sites_to_sample)):
-                # Sample within 1-5km of positive site
-                offset_x = np.random.uniform(-0.05, 0.05)  # ~5km
-                offset_y = np.random.uniform(-0.05, 0.05)
-                
-                neg_x = site.geometry.x + offset_x
-                neg_y = site.geometry.y + offset_y
-                
-                # Ensure within bounds
-                if (bounds.left <= neg_x <= bounds.right and 
-                    bounds.bottom <= neg_y <= bounds.top):
-                    negative_points.append(Point(neg_x, neg_y))
-                
-                if len(negative_points) >= near_negatives_needed:
-                    break
-            if len(negative_points) >= near_negatives_needed:
-                break
-    
+        samples_per_site = max(1, near_negatives_needed // sites_to_sample)
+
+        # Draw every jittered coordinate in one vectorized pass (~5km offsets)
+        near_x = np.repeat(sampled_sites.geometry.x.values, samples_per_site)
+        near_y = np.repeat(sampled_sites.geometry.y.values, samples_per_site)
+        near_x = near_x + rng.uniform(-0.05, 0.05, size=near_x.size)
+        near_y = near_y + rng.uniform(-0.05, 0.05, size=near_y.size)
+
+        # Keep in-bounds points only, capped at the near-negative budget
+        in_bounds = ((bounds.left <= near_x) & (near_x <= bounds.right) &
+                     (bounds.bottom <= near_y) & (near_y <= bounds.top))
+        near_x = near_x[in_bounds][:near_negatives_needed]
+        near_y = near_y[in_bounds][:near_negatives_needed]
+
     # 30% of negatives: Random locations - EASIER NEGATIVES
-    random_negatives_needed = n_negative - len(negative_points)
-    for _ in range(random_negatives_needed):
-        x = np.random.uniform(bounds.left, bounds.right)
-        y = np.random.uniform(bounds.bottom, bounds.top)
-        negative_points.append(Point(x, y))
-    
-    logger.info(f"   Generated {len(negative_points)} negative samples ({int(n_negative * 0.7)} near sites, {random_negatives_needed} random)")
+    random_negatives_needed = n_negative - near_x.size
+
+    # Fill one preallocated (N, 2) coordinate block by slice assignment
+    # rather than concatenating per-category arrays
+    negative_xy = np.empty((n_negative, 2), dtype=np.float64)
+    negative_xy[:near_x.size, 0] = near_x
+    negative_xy[:near_x.size, 1] = near_y
+    negative_xy[near_x.size:, 0] = rng.uniform(bounds.left, bounds.right, size=random_negatives_needed)
+    negative_xy[near_x.size:, 1] = rng.uniform(bounds.bottom, bounds.top, size=random_negatives_needed)
+
+    # Build all geometries at once instead of per-point Point() calls
+    negative_points = list(gpd.points_from_xy(negative_xy[:, 0], negative_xy[:, 1]))
+
+    logger.info(f"   Generated {len(negative_points)} negative samples ({near_x.size} near sites, {random_negatives_needed} random)")
     return negative_points
 
 def save_model_and_checkpoints(model, model_path, checkpoint_data, checkpoint_path):
     """Save model and checkpoint data"""
-    import joblib
-    
-    # Save model
-    joblib.dump(model, model_path)
-    
+    # Save model through XGBoost's native serializer instead of pickling
+    # the whole sklearn wrapper object graph
+    if hasattr(model, 'save'):
+        model.save(model_path)
+    else:
+        if not model_path.endswith(('.ubj', '.json')):
+            model_path = model_path + '.ubj'
+        model.save_model(model_path)
+
     # Save checkpoint data
     with open(checkpoint_path, 'w') as f:
         json.dump(checkpoint_data, f, indent=2)
@@ -225,6 +279,13 @@ def save_model_and_checkpoints(model, model_path, checkpoint_data, checkpoint_pa
 
 def main_ultimate_pipeline():
     """Execute the complete archaeological discovery pipeline - FIXED VERSION"""
+    # Deferred imports: these pull in xgboost, folium and openai, which cost
+    # seconds of interpreter startup and are only needed once the pipeline
+    # actually runs
+    from models.archaeological_ensemble import UltimateArchaeologicalEnsemble
+    from visualization.interactive_maps import create_ultimate_interactive_map
+    from visualization.ai_analysis import generate_ai_archaeological_analysis
+
     logger.info("ULTIMATE ARCHAEOLOGICAL DISCOVERY SYSTEM")
     logger.info("=" * 60)
     
@@ -237,4 +298,4 @@ def main_ultimate_pipeline():
     }
     
     for dir_path in output_dirs.values():
-        os.
+        os.makedirs(dir_path, exist_ok=True)
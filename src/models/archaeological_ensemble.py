@@ -2,7 +2,7 @@
 Archaeological ensemble model using XGBoost with CPU/GPU support.
 """
 
-import xgboost as xgb
+import os
 import logging
 
 logger = logging.getLogger(__name__)
@@ -15,6 +15,10 @@ class UltimateArchaeologicalEnsemble:
         Args:
             use_gpu: Whether to use GPU acceleration (if available)
         """
+        # Imported lazily so the pipeline module loads without paying
+        # xgboost's import cost up front
+        import xgboost as xgb
+
         # Detect GPU availability
         gpu_available = False
         if use_gpu:
@@ -25,13 +29,17 @@ class UltimateArchaeologicalEnsemble:
             except ImportError:
                 logger.info("CuPy not available, using CPU")
         
-        # Configure XGBoost parameters based on hardware
+        # Configure XGBoost parameters based on hardware. The unified
+        # XGBoost >= 2.0 API selects the GPU via device='cuda' with the
+        # plain hist tree method; max_bin=256 keeps the quantized feature
+        # bins in uint8, so training streams bin indices instead of fp32.
         if gpu_available and use_gpu:
             self.model = xgb.XGBClassifier(
                 objective='binary:logistic',
                 eval_metric='logloss',
-                tree_method='gpu_hist',
-                device='cuda:0',
+                tree_method='hist',
+                device='cuda',
+                max_bin=256,
                 n_estimators=100,
                 learning_rate=0.01,
                 max_depth=3,
@@ -47,6 +55,7 @@ class UltimateArchaeologicalEnsemble:
                 objective='binary:logistic',
                 eval_metric='logloss',
                 tree_method='hist',  # CPU version
+                max_bin=256,
                 n_estimators=100,
                 learning_rate=0.01,
                 max_depth=3,
@@ -74,14 +83,18 @@ class UltimateArchaeologicalEnsemble:
         return self.model.predict_proba(X)[:, 1]
 
     def save(self, path):
-        """Save model to file"""
-        import joblib
-        joblib.dump(self.model, path)
+        """Save model to file in XGBoost's native binary format"""
+        # Native UBJSON stores the trees as compact flat arrays and stays
+        # stable across XGBoost versions, unlike pickling the wrapper
+        if not path.endswith(('.ubj', '.json')):
+            path = path + '.ubj'
+        self.model.save_model(path)
         logger.info(f"Model saved to {path}")
 
     def load(self, path):
-        """Load model from file"""
-        import joblib
-        self.model = joblib.load(path)
+        """Load model from a native XGBoost model file"""
+        if not os.path.exists(path) and os.path.exists(path + '.ubj'):
+            path = path + '.ubj'
+        self.model.load_model(path)
         self.is_fitted = True
         logger.info(f"Model loaded from {path}")
@@ -3,50 +3,27 @@ AI-powered archaeological analysis using OpenAI.
 """
 
 import os
-from openai import OpenAI
 import logging
 
 logger = logging.getLogger(__name__)
 
-def generate_ai_archaeological_analysis(hotspots_gdf, model_performance):
-    """
-    Generate AI-powered archaeological interpretation using OpenAI.
-    
-    Args:
-        hotspots_gdf: GeoDataFrame containing discovered hotspots
-        model_performance: Model AUC score for analysis
-        
-    Returns:
-        str: AI-generated archaeological analysis
-    """
-    if hotspots_gdf.empty:
-        return "No hotspots identified for analysis"
-    
-    # Initialize OpenAI client
-    try:
-        api_key = os.getenv('OPENAI_API_KEY')
-        if not api_key:
-            logger.error("OpenAI API key not found in environment variables")
-            return "OpenAI API key not configured. Please check your .env file."
-        
-        client = OpenAI(api_key=api_key)
-        logger.info("OpenAI client initialized successfully")
-    except Exception as e:
-        logger.error(f"Failed to initialize OpenAI client: {e}")
-        return f"OpenAI client initialization failed: {e}"
-    
-    # Get top hotspot for analysis
-    top_hotspot = hotspots_gdf.iloc[0]
-    
-    # Create detailed archaeological prompt
-    prompt = f"""
+OPENAI_MODEL = "gpt-4o"
+
+SYSTEM_PROMPT = (
+    "You are Dr. Maria Santos, a distinguished archaeologist specializing in "
+    "pre-Columbian Amazonian civilizations with 25 years of field experience."
+)
+
+# Prompt template shared by the single and batch analysis paths; only the
+# per-hotspot numbers are substituted at call time
+ANALYSIS_PROMPT_TEMPLATE = """
 You are Dr. Maria Santos, a world-renowned archaeologist specializing in pre-Columbian Amazonian civilizations with 25 years of field experience.
 
 An advanced AI system has identified a high-probability archaeological site using multi-sensor remote sensing analysis:
 
 **DISCOVERY DETAILS:**
-- Location: {top_hotspot.geometry.y:.6f}°N, {top_hotspot.geometry.x:.6f}°W
-- AI Confidence: {top_hotspot.mean_prob:.1%}
+- Location: {latitude:.6f}°N, {longitude:.6f}°W
+- AI Confidence: {confidence:.1%}
 - Model Performance: ROC AUC {model_performance:.3f}
 - Analysis Method: FABDEM DTM + NASA HLS temporal analysis + Copernicus validation
 
@@ -65,32 +42,84 @@ Based on this multi-sensor evidence, provide a 2-paragraph archaeological assess
 
 Provide your expert opinion as if briefing a research expedition team.
 """
-    
+
+# Only a successfully built client is cached; a missing key is re-checked
+# per call so a .env file loaded after the first attempt is still picked up
+_openai_client = None
+
+def _get_openai_client():
+    """Create the OpenAI client on first success and reuse it across calls.
+
+    Returns None when no API key is configured. Import and construction
+    errors propagate to the caller.
+    """
+    global _openai_client
+    if _openai_client is None:
+        api_key = os.getenv('OPENAI_API_KEY')
+        if not api_key:
+            logger.error("OpenAI API key not found in environment variables")
+            return None
+        from openai import OpenAI
+        _openai_client = OpenAI(api_key=api_key)
+    return _openai_client
+
+def _build_analysis_prompt(hotspot, model_performance):
+    """Fill the shared prompt template for one hotspot."""
+    return ANALYSIS_PROMPT_TEMPLATE.format(
+        latitude=hotspot.geometry.y,
+        longitude=hotspot.geometry.x,
+        confidence=hotspot.mean_prob,
+        model_performance=model_performance
+    )
+
+def generate_ai_archaeological_analysis(hotspots_gdf, model_performance):
+    """
+    Generate AI-powered archaeological interpretation using OpenAI.
+
+    Args:
+        hotspots_gdf: GeoDataFrame containing discovered hotspots
+        model_performance: Model AUC score for analysis
+
+    Returns:
+        str: AI-generated archaeological analysis
+    """
+    if hotspots_gdf.empty:
+        return "No hotspots identified for analysis"
+
+    # Reuse the cached OpenAI client; construction failures (including a
+    # missing openai package, since the import is lazy) must not escape a
+    # function that always returns a string
+    try:
+        client = _get_openai_client()
+    except Exception as e:
+        logger.error(f"OpenAI client initialization failed: {e}")
+        return f"OpenAI client initialization failed: {e}"
+    if client is None:
+        return "OpenAI API key not configured. Please check your .env file."
+
+    # Get top hotspot for analysis
+    top_hotspot = hotspots_gdf.iloc[0]
+    prompt = _build_analysis_prompt(top_hotspot, model_performance)
+
     try:
         # Generate AI analysis
         response = client.chat.completions.create(
-            model="gpt-4o",
+            model=OPENAI_MODEL,
             messages=[
-                {
-                    "role": "system", 
-                    "content": "You are Dr. Maria Santos, a distinguished archaeologist specializing in pre-Columbian Amazonian civilizations with 25 years of field experience."
-                },
-                {
-                    "role": "user", 
-                    "content": prompt
-                }
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
             ],
             max_tokens=800,
             temperature=0.3
         )
-        
+
         ai_analysis = response.choices[0].message.content
         logger.info("AI archaeological analysis generated successfully")
         return ai_analysis
-        
+
     except Exception as e:
         logger.error(f"OpenAI API call failed: {e}")
-        
+
         # Fallback analysis if OpenAI fails
         fallback_analysis = f"""
 AI ARCHAEOLOGICAL INTERPRETATION
@@ -101,13 +130,13 @@ AI Confidence: {top_hotspot.mean_prob:.1%}
 Model Performance: ROC AUC {model_performance:.3f}
 
 **SITE SIGNIFICANCE:**
-This multi-sensor analysis has identified a high-probability archaeological anomaly using advanced 
-remote sensing techniques. The combination of topographic irregularities, temporal vegetation 
+This multi-sensor analysis has identified a high-probability archaeological anomaly using advanced
+remote sensing techniques. The combination of topographic irregularities, temporal vegetation
 stability patterns, and spectral signatures suggests potential pre-Columbian earthwork construction.
 
 **RESEARCH PRIORITY:**
-Based on the AI confidence score of {top_hotspot.mean_prob:.1%}, this site merits immediate field 
-investigation. The detected patterns are consistent with known geoglyph characteristics in the 
+Based on the AI confidence score of {top_hotspot.mean_prob:.1%}, this site merits immediate field
+investigation. The detected patterns are consistent with known geoglyph characteristics in the
 Amazon basin, including geometric earthwork formations and altered soil composition signatures.
 
 **RECOMMENDED METHODS:**
@@ -119,3 +148,75 @@ Amazon basin, including geometric earthwork formations and altered soil composit
 Note: OpenAI API error: {e}
 """
         return fallback_analysis
+
+def generate_batch_archaeological_analyses(hotspots_gdf, model_performance, max_hotspots=5):
+    """
+    Analyze several hotspots concurrently with the async OpenAI client.
+
+    The completion requests are issued together via asyncio.gather, so k
+    hotspots cost roughly one API round-trip of wall-clock time instead of
+    k sequential ones.
+
+    Args:
+        hotspots_gdf: GeoDataFrame containing discovered hotspots
+        model_performance: Model AUC score for analysis
+        max_hotspots: Maximum number of hotspots to analyze
+
+    Returns:
+        List of analysis strings, one per analyzed hotspot
+    """
+    import asyncio
+
+    if hotspots_gdf.empty:
+        return []
+
+    api_key = os.getenv('OPENAI_API_KEY')
+    if not api_key:
+        logger.error("OpenAI API key not found in environment variables")
+        return ["OpenAI API key not configured. Please check your .env file."]
+
+    # Import lazily, and only once we know a key is configured, so a broken
+    # or missing openai install degrades to an error string like the
+    # synchronous path does
+    try:
+        from openai import AsyncOpenAI
+    except Exception as e:
+        logger.error(f"OpenAI client initialization failed: {e}")
+        return [f"OpenAI client initialization failed: {e}"]
+
+    selected_hotspots = [hotspots_gdf.iloc[i]
+                         for i in range(min(max_hotspots, len(hotspots_gdf)))]
+
+    async def _analyze_one(client, hotspot):
+        response = await client.chat.completions.create(
+            model=OPENAI_MODEL,
+            messages=[
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": _build_analysis_prompt(hotspot, model_performance)}
+            ],
+            max_tokens=800,
+            temperature=0.3
+        )
+        return response.choices[0].message.content
+
+    async def _analyze_all():
+        client = AsyncOpenAI(api_key=api_key)
+        try:
+            return await asyncio.gather(
+                *[_analyze_one(client, hotspot) for hotspot in selected_hotspots],
+                return_exceptions=True)
+        finally:
+            await client.close()
+
+    results = asyncio.run(_analyze_all())
+
+    analyses = []
+    for result in results:
+        if isinstance(result, Exception):
+            logger.error(f"OpenAI API call failed for hotspot: {result}")
+            analyses.append(f"Analysis failed: {result}")
+        else:
+            analyses.append(result)
+
+    logger.info(f"Generated {len(analyses)} AI archaeological analyses")
+    return analyses
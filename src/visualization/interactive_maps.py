@@ -2,17 +2,49 @@
 Interactive map creation for archaeological discoveries.
 """
 
-import folium
-from folium.plugins import HeatMap, Fullscreen, MeasureControl
+import functools
 import geopandas as gpd
-from shapely.geometry import Point
+import numpy as np
+import shapely
 import logging
-from pyproj import Transformer
 
 logger = logging.getLogger(__name__)
 
+@functools.lru_cache(maxsize=32)
+def _wgs84_transformer(crs_wkt):
+    """Cache one WGS84 transformer per source CRS; building a Transformer
+    parses PROJ pipelines and is far more expensive than the transform."""
+    from pyproj import Transformer
+    return Transformer.from_crs(crs_wkt, "EPSG:4326", always_xy=True)
+
+def _decimate_heat_points(lons, lats, probs, resolution=1e-3):
+    """
+    Bin prediction points onto a ~resolution-degree grid.
+
+    folium embeds every heatmap point as JSON in the saved HTML, so dense
+    prediction grids make the map huge and slow to render. Snapping points
+    to grid cells and keeping the maximum probability per occupied cell
+    bounds the payload by the covered area instead of the prediction count.
+    """
+    cell_rows = np.floor(lats / resolution).astype(np.int64)
+    cell_cols = np.floor(lons / resolution).astype(np.int64)
+    cells = np.stack([cell_rows, cell_cols], axis=1)
+
+    unique_cells, inverse = np.unique(cells, axis=0, return_inverse=True)
+    cell_probs = np.zeros(len(unique_cells), dtype=np.float64)
+    np.maximum.at(cell_probs, inverse, probs)
+
+    cell_lats = (unique_cells[:, 0] + 0.5) * resolution
+    cell_lons = (unique_cells[:, 1] + 0.5) * resolution
+    return cell_lons, cell_lats, cell_probs
+
 def create_ultimate_interactive_map(pred_gdf, hotspots_gdf, known_sites_gdf, dtm_raster, save_path):
     """Create an interactive map showing archaeological hotspots and known sites."""
+    # folium and pyproj are imported lazily; they are only needed when a
+    # map is actually rendered
+    import folium
+    from folium.plugins import HeatMap, Fullscreen, MeasureControl
+
     logger.info("Creating ultimate interactive map...")
     
     # Convert to lat/lon for Folium
@@ -21,9 +53,11 @@ def create_ultimate_interactive_map(pred_gdf, hotspots_gdf, known_sites_gdf, dtm
     # Robust map center calculation
     try:
         if dtm_raster is not None:
-            transformer = Transformer.from_crs(dtm_raster.crs, "EPSG:4326", always_xy=True)
-            min_lon, min_lat = transformer.transform(dtm_raster.bounds.left, dtm_raster.bounds.bottom)
-            max_lon, max_lat = transformer.transform(dtm_raster.bounds.right, dtm_raster.bounds.top)
+            transformer = _wgs84_transformer(dtm_raster.crs.to_wkt())
+            # Transform both corners in one vectorized call
+            (min_lon, max_lon), (min_lat, max_lat) = transformer.transform(
+                [dtm_raster.bounds.left, dtm_raster.bounds.right],
+                [dtm_raster.bounds.bottom, dtm_raster.bounds.top])
             map_center = [(min_lat + max_lat) / 2, (min_lon + max_lon) / 2]
         else:
             map_center = [-10.0, -67.0]  # Default Amazon center
@@ -49,8 +83,18 @@ def create_ultimate_interactive_map(pred_gdf, hotspots_gdf, known_sites_gdf, dtm
     # Add probability heatmap
     if pred_gdf is not None and not pred_gdf.empty:
         try:
-            heat_data = [[row.geometry.y, row.geometry.x, row.probability] 
-                         for _, row in pred_gdf.to_crs("EPSG:4326").iterrows()]
+            # Pull every coordinate pair out in one GEOS call; iterrows
+            # over thousands of candidate pixels was the map bottleneck
+            pred_wgs = pred_gdf.to_crs("EPSG:4326")
+            coords = shapely.get_coordinates(pred_wgs.geometry.values)
+
+            # Decimate to one max-probability point per ~100m grid cell so
+            # the serialized heatmap stays small for dense prediction grids
+            lons, lats, probs = _decimate_heat_points(
+                coords[:, 0], coords[:, 1], pred_wgs['probability'].to_numpy())
+            logger.info(f"Heatmap decimated from {len(coords)} to {len(probs)} points")
+
+            heat_data = np.column_stack([lats, lons, probs]).tolist()
             HeatMap(heat_data, name='Archaeological Probability', radius=15, blur=10).add_to(m)
         except Exception as e:
             logger.warning(f"Heatmap creation failed: {e}")
@@ -75,22 +119,28 @@ def create_ultimate_interactive_map(pred_gdf, hotspots_gdf, known_sites_gdf, dtm
         try:
             hotspots_latlon = hotspots_gdf.to_crs("EPSG:4326")
             hotspots_layer = folium.FeatureGroup(name='New Discoveries').add_to(m)
-            
-            for idx, row in hotspots_latlon.iterrows():
+
+            # Pull coordinates, confidences and colors out as plain arrays
+            # first; the remaining loop only touches primitive values
+            xs = hotspots_latlon.geometry.x.to_numpy()
+            ys = hotspots_latlon.geometry.y.to_numpy()
+            probs = hotspots_latlon['mean_prob'].to_numpy()
+            colors = np.where(probs > 0.7, 'red',
+                              np.where(probs > 0.5, 'orange', 'yellow'))
+
+            for i in range(len(xs)):
                 popup_html = f"""
                 <div style="width: 300px;">
-                    <h4>Discovery #{idx+1}</h4>
-                    <p><b>Coordinates:</b> {row.geometry.y:.6f}, {row.geometry.x:.6f}</p>
-                    <p><b>Confidence:</b> {row.mean_prob:.2%}</p>
+                    <h4>Discovery #{i+1}</h4>
+                    <p><b>Coordinates:</b> {ys[i]:.6f}, {xs[i]:.6f}</p>
+                    <p><b>Confidence:</b> {probs[i]:.2%}</p>
                 </div>
                 """
-                
-                color = 'red' if row.mean_prob > 0.7 else 'orange' if row.mean_prob > 0.5 else 'yellow'
-                
+
                 folium.Marker(
-                    [row.geometry.y, row.geometry.x], 
+                    [ys[i], xs[i]],
                     popup=folium.Popup(popup_html, max_width=300),
-                    icon=folium.Icon(color=color, icon='star')
+                    icon=folium.Icon(color=colors[i], icon='star')
                 ).add_to(hotspots_layer)
         except Exception as e:
             logger.warning(f"Hotspots layer failed: {e}")